@@ -1,24 +1,49 @@
 #!/usr/bin/env python3
-import requests
-import json
+import aiohttp
+import asyncio
+import orjson
 import os
 import sys
 import time
+import random
 import argparse
-from collections import defaultdict
+import itertools
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from leaderboard import build_markdown_iter, match_contributors, rank_users
 
 
-TOKEN = os.environ.get("TOKEN")
+TOKENS = [t.strip() for t in (os.environ.get("TOKENS") or os.environ.get("TOKEN") or "").split(",") if t.strip()]
 REPOS = ["NepTechTribe/CodeVault", "NepTechTribe/EventLog"] 
 PER_PAGE = 100
-HEADERS = {"Accept": "application/vnd.github.v3+json"}
-if TOKEN:
-    HEADERS["Authorization"] = f"token {TOKEN}"
+MAX_TRIES = 5
+MAX_CONNECTIONS = 20
+MAX_CONCURRENT_REQUESTS = 10
+KEEPALIVE_TIMEOUT = 30
+REQUEST_TIMEOUT = 60
+DEFAULT_HEADERS = {"Accept": "application/vnd.github.v3+json"}
+GRAPHQL_URL = "https://api.github.com/graphql"
+GRAPHQL_BATCH_SIZE = 50
+ETAG_CACHE = "data/etag_cache.json"
+CONTRIBUTOR_FIELDS = ("login", "contributions", "avatar_url", "html_url")
+WRITE_BUFFER_SIZE = 1 << 16
+STATE_FILE = "data/state.json"
+ISO_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+SEARCH_INDEX_LAG = 3600
+USER_META_CACHE = "data/user_meta_cache.json"
+USER_META_TTL = 30 * 24 * 3600  # well past the weekly schedule so cached entries survive between runs
+RATE_LIMIT_THRESHOLDS = {"core": 50, "search": 1, "graphql": 50}
+RATE_LIMIT_RESET_MARGIN = 2
+SECONDARY_RATE_LIMIT_WAIT = 60
+
+_token_cycle = itertools.cycle(TOKENS or [None])
+# (token, resource) -> (remaining, reset_ts) as last reported by the API
+_token_limits = {}
 
 def load_participants(path="data/participants.json"):
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            items = json.load(f)
+        with open(path, "rb") as f:
+            items = orjson.loads(f.read())
             return set(items)
     except FileNotFoundError:
         print(f"Participants file not found at {path}. Exiting.", file=sys.stderr)
@@ -27,107 +52,403 @@ def load_participants(path="data/participants.json"):
         print(f"Error loading participants: {e}", file=sys.stderr)
         sys.exit(1)
 
-def handle_rate_limit(resp):
-    if resp.status_code == 403:
+def load_cache(path):
+    try:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        print(f"Warning: ignoring unreadable cache {path}: {e}", file=sys.stderr)
+        return {}
+
+def save_cache(path, data):
+    with open(path, "wb") as f:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS))
+
+def token_available(token, resource, now):
+    remaining, reset_ts = _token_limits.get((token, resource), (None, 0))
+    return remaining is None or remaining >= RATE_LIMIT_THRESHOLDS.get(resource, 1) or reset_ts + RATE_LIMIT_RESET_MARGIN <= now
+
+def next_token(resource="core"):
+    """
+    Return the next token in round-robin order, skipping tokens whose remaining
+    quota for resource is below its threshold until their reset time.
+    """
+    now = time.time()
+    for _ in range(max(1, len(TOKENS))):
+        token = next(_token_cycle)
+        if token_available(token, resource, now):
+            return token
+    return min(TOKENS or [None], key=lambda t: _token_limits.get((t, resource), (None, 0))[1])
+
+def get_headers(resource="core"):
+    headers = {}
+    token = next_token(resource)
+    if token:
+        headers["Authorization"] = f"token {token}"
+    return headers
+
+def token_from_headers(headers):
+    auth = headers.get("Authorization")
+    return auth.split(" ", 1)[1] if auth else None
+
+def record_rate_limit(resp, headers):
+    rem = resp.headers.get("X-RateLimit-Remaining")
+    reset = resp.headers.get("X-RateLimit-Reset")
+    if rem is None or reset is None:
+        return
+    resource = resp.headers.get("X-RateLimit-Resource", "core")
+    _token_limits[(token_from_headers(headers), resource)] = (int(rem), int(reset))
+
+def handle_rate_limit(resp, headers):
+    """
+    Record resp's rate-limit headers. If resp hit the primary limit, return how many
+    seconds to wait before retrying (0 when another token can be used right away);
+    otherwise return None.
+    """
+    record_rate_limit(resp, headers)
+    # the primary limit comes back as 403 or 429 with X-RateLimit-Remaining: 0
+    if resp.status in (403, 429):
         rem = resp.headers.get("X-RateLimit-Remaining")
         reset = resp.headers.get("X-RateLimit-Reset")
         if rem == "0" and reset:
-            reset_ts = int(reset)
-            wait = max(0, reset_ts - int(time.time())) + 2
-            print(f"Rate limit reached. Sleeping for {wait}s until reset.")
-            time.sleep(wait)
-            return True
-    return False
+            resource = resp.headers.get("X-RateLimit-Resource", "core")
+            now = time.time()
+            # retry at once only on another token; the one that just failed waits for its reset
+            failed = token_from_headers(headers)
+            if any(token_available(t, resource, now) for t in TOKENS if t != failed):
+                return 0
+            reset_ts = min(_token_limits.get((t, resource), (0, int(reset)))[1] for t in TOKENS or [None])
+            return max(0, reset_ts - int(now)) + RATE_LIMIT_RESET_MARGIN
+    return None
 
-def fetch_contributors_for_repo(repo):
+def retry_after(resp, body):
     """
-    Fetch contributors for a repo using the contributors endpoint with pagination.
-    Returns a list of contributor dicts (as returned by the API).
+    Seconds to wait before retrying resp, or None if it is not a transient failure:
+    5xx, 429 and secondary rate-limit 403s. Retry-After wins when present; secondary
+    limits without it wait SECONDARY_RATE_LIMIT_WAIT, everything else returns 0 for backoff.
     """
-    contributors = []
-    page = 1
+    header = resp.headers.get("Retry-After")
+    if header and header.isdigit() and (resp.status >= 500 or resp.status in (403, 429)):
+        return int(header)
+    if resp.status in (403, 429) and b"rate limit" in body.lower():
+        return SECONDARY_RATE_LIMIT_WAIT
+    if resp.status >= 500 or resp.status == 429:
+        return 0
+    return None
+
+async def api_request(session, sem, method, url, resource="core", headers=None, **kwargs):
+    """
+    Issue a request with the next token, waiting out primary rate limits and retrying
+    transient failures with exponential backoff and jitter (or the Retry-After header).
+    Returns (resp, body) with the raw body bytes; resp is None if the request never got a response.
+    """
+    attempt = 0
     while True:
-        url = f"https://api.github.com/repos/{repo}/contributors"
-        params = {"per_page": PER_PAGE, "page": page}
-        resp = requests.get(url, headers=HEADERS, params=params)
-        if handle_rate_limit(resp):
-            continue
-        if resp.status_code != 200:
-            print(f"Warning: failed to fetch contributors for {repo} (page {page}): {resp.status_code} {resp.text}", file=sys.stderr)
-            break
-        page_items = resp.json()
-        if not page_items:
-            break
-        contributors.extend(page_items)
-        if len(page_items) < PER_PAGE:
-            break
-        page += 1
+        req_headers = {**get_headers(resource), **(headers or {})}
+        try:
+            async with sem, session.request(method, url, headers=req_headers, **kwargs) as resp:
+                rate_limit_wait = handle_rate_limit(resp, req_headers)
+                if rate_limit_wait is None:
+                    body = await resp.read()
+            # sleep after releasing the semaphore slot and connection
+            if rate_limit_wait is not None:
+                if rate_limit_wait:
+                    print(f"Rate limit reached on all tokens. Sleeping for {rate_limit_wait}s until reset.")
+                    await asyncio.sleep(rate_limit_wait)
+                continue
+            wait = retry_after(resp, body)
+            if wait is None:
+                return resp, body
+            error = f"{resp.status} {body.decode('utf-8', 'replace')}"
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            resp, body, wait = None, b"", 0
+            error = repr(e)
+        attempt += 1
+        if attempt >= MAX_TRIES:
+            print(f"Warning: giving up on {url} after {attempt} attempts: {error}", file=sys.stderr)
+            return resp, body
+        wait = wait or 2 ** attempt + random.random()
+        print(f"Transient failure on {url} ({error}); retrying in {wait:.1f}s.", file=sys.stderr)
+        await asyncio.sleep(wait)
+
+async def fetch_contributors_page(session, sem, repo, page, cache):
+    """
+    Fetch one page of contributors, sending the cached ETag; a 304 reuses the cached items.
+    Returns (items, last_page) where last_page comes from the Link header;
+    items is None if the page could not be fetched.
+    """
+    repo_cache = cache.setdefault(repo, {})
+    url = f"https://api.github.com/repos/{repo}/contributors"
+    params = {"per_page": PER_PAGE, "page": page}
+    cached = repo_cache.get(str(page))
+    headers = {"If-None-Match": cached["etag"]} if cached and cached.get("etag") else None
+    resp, body = await api_request(session, sem, "GET", url, headers=headers, params=params)
+    if resp is None:
+        return None, page
+    if resp.status == 304 and cached:
+        return cached["items"], cached.get("last", page)
+    if resp.status != 200:
+        print(f"Warning: failed to fetch contributors for {repo} (page {page}): {resp.status} {body.decode('utf-8', 'replace')}", file=sys.stderr)
+        return None, page
+    last = resp.links.get("last")
+    last_page = int(last["url"].query.get("page", page)) if last else page
+    items = [{k: c.get(k) for k in CONTRIBUTOR_FIELDS} for c in orjson.loads(body)]
+    repo_cache[str(page)] = {"etag": resp.headers.get("ETag", ""), "items": items, "last": last_page}
+    return items, last_page
+
+async def fetch_contributors_for_repo(session, sem, repo, cache, participants):
+    """
+    Fetch contributors for a repo using the contributors endpoint with pagination.
+    Page 1 reveals the last page number, then the remaining pages are fetched concurrently
+    in waves, stopping early once every participant has been seen.
+    Returns a list of contributor dicts (login, contributions, avatar_url, html_url).
+    """
+    items, last_page = await fetch_contributors_page(session, sem, repo, 1, cache)
+    if items is None:
+        return []
+    contributors = list(items)
+    unseen = set(participants).difference(c["login"] for c in items)
+    fetched = 1
+    # a 304 on page 1 reports the cached last page, so later pages may extend the range
+    while unseen and fetched < last_page:
+        wave = range(fetched + 1, min(last_page, fetched + MAX_CONCURRENT_REQUESTS) + 1)
+        pages = await asyncio.gather(*[fetch_contributors_page(session, sem, repo, page, cache) for page in wave])
+        fetched = wave[-1]
+        for page_items, page_last in pages:
+            if page_items:
+                contributors.extend(page_items)
+                unseen.difference_update(c["login"] for c in page_items)
+            last_page = max(last_page, page_last)
+    repo_cache = cache[repo]
+    for key in [k for k in repo_cache if int(k) > last_page]:
+        del repo_cache[key]
     return contributors
 
-def fetch_issues_and_prs_for_author(repo, author):
+def search_query(repo, author, kind, created=None):
+    query = f"repo:{repo} author:{author} is:{kind}"
+    return f"{query} created:{created}" if created else query
+
+def created_range(since, until):
     """
-    Count issues and PRs in repo created by author (all states).
-    Uses the issues endpoint with creator=author; paginated.
-    Returns tuple (num_issues, num_prs).
+    Search qualifier value matching items created after since (exclusive) up to until (inclusive).
+    With no since, everything up to until matches.
     """
-    issues_count = 0
-    prs_count = 0
-    page = 1
-    while True:
-        url = f"https://api.github.com/repos/{repo}/issues"
-        params = {"per_page": PER_PAGE, "page": page, "state": "all", "creator": author}
-        resp = requests.get(url, headers=HEADERS, params=params)
-        if handle_rate_limit(resp):
-            continue
-        if resp.status_code != 200:
-            print(f"Warning: failed to fetch issues for {author} in {repo} (page {page}): {resp.status_code} {resp.text}", file=sys.stderr)
-            break
-        items = resp.json()
-        if not items:
-            break
-        for it in items:
-            if it.get("pull_request"):
-                prs_count += 1
-            else:
-                issues_count += 1
-        if len(items) < PER_PAGE:
-            break
-        page += 1
+    if not since:
+        return f"<={until}"
+    start = datetime.strptime(since, ISO_FORMAT) + timedelta(seconds=1)
+    return f"{start.strftime(ISO_FORMAT)}..{until}"
+
+async def search_issue_count(session, sem, query):
+    """
+    Return total_count for a search/issues query without fetching result bodies.
+    Returns None if the search fails.
+    """
+    url = "https://api.github.com/search/issues"
+    params = {"q": query, "per_page": 1}
+    resp, body = await api_request(session, sem, "GET", url, resource="search", params=params)
+    if resp is None:
+        return None
+    if resp.status != 200:
+        print(f"Warning: search failed for '{query}': {resp.status} {body.decode('utf-8', 'replace')}", file=sys.stderr)
+        return None
+    return orjson.loads(body).get("total_count", 0)
+
+async def fetch_issues_and_prs_for_author(session, sem, repo, author, created=None):
+    """
+    Count issues and PRs in repo created by author (all states), optionally
+    restricted to a created: range. Uses the search API total_count, so it costs exactly two requests.
+    Returns tuple (num_issues, num_prs), or None if either search failed.
+    """
+    issues_count, prs_count = await asyncio.gather(
+        search_issue_count(session, sem, search_query(repo, author, "issue", created)),
+        search_issue_count(session, sem, search_query(repo, author, "pr", created)),
+    )
+    if issues_count is None or prs_count is None:
+        return None
     return issues_count, prs_count
 
-def get_user_meta(login):
+async def fetch_counts_graphql(session, sem, repo, logins, created=None):
+    """
+    Count issues and PRs in repo for a batch of logins with one GraphQL request,
+    using an aliased search field per (login, kind), optionally restricted to a created: range.
+    Returns dict login -> (num_issues, num_prs); logins missing from the response are omitted.
+    """
+    fields = []
+    for n, login in enumerate(logins):
+        fields.append(f"i{n}: search(query: {orjson.dumps(search_query(repo, login, 'issue', created)).decode()}, type: ISSUE) {{ issueCount }}")
+        fields.append(f"p{n}: search(query: {orjson.dumps(search_query(repo, login, 'pr', created)).decode()}, type: ISSUE) {{ issueCount }}")
+    query = "query {\n  " + "\n  ".join(fields) + "\n}"
+    resp, body = await api_request(session, sem, "POST", GRAPHQL_URL, resource="graphql", json={"query": query})
+    if resp is None:
+        return {}
+    if resp.status != 200:
+        print(f"Warning: GraphQL counts failed for {repo}: {resp.status} {body.decode('utf-8', 'replace')}", file=sys.stderr)
+        return {}
+    body = orjson.loads(body)
+    for err in body.get("errors") or []:
+        print(f"Warning: GraphQL error for {repo}: {err.get('message')}", file=sys.stderr)
+    data = body.get("data") or {}
+    counts = {}
+    for n, login in enumerate(logins):
+        issues, prs = data.get(f"i{n}"), data.get(f"p{n}")
+        if issues and prs:
+            counts[login] = (issues.get("issueCount", 0), prs.get("issueCount", 0))
+    return counts
+
+async def count_issues_and_prs(session, sem, repos, participants, counts, until):
+    """
+    Bring per-repo issue/PR counts up to until. Logins with a saved count only search
+    for items created since its as_of timestamp; the rest are counted in full.
+    counts is {repo: {login: {"issues", "prs", "as_of"}}} as saved in STATE_FILE; returns
+    an updated copy in which entries whose lookup failed keep their previous value.
+    """
+    jobs = []
+    for repo in repos:
+        repo_counts = counts.get(repo, {})
+        by_since = {}
+        for login in sorted(participants):
+            by_since.setdefault(repo_counts.get(login, {}).get("as_of"), []).append(login)
+        for since, logins in by_since.items():
+            created = created_range(since, until)
+            jobs.extend((repo, created, logins[i:i + GRAPHQL_BATCH_SIZE]) for i in range(0, len(logins), GRAPHQL_BATCH_SIZE))
+
+    if TOKENS:
+        # GraphQL needs authentication; batch logins into aliased queries
+        results = await asyncio.gather(*[fetch_counts_graphql(session, sem, repo, logins, created) for repo, created, logins in jobs])
+    else:
+        per_job = await asyncio.gather(*[
+            asyncio.gather(*[fetch_issues_and_prs_for_author(session, sem, repo, login, created) for login in logins])
+            for repo, created, logins in jobs
+        ])
+        results = [
+            {login: result for login, result in zip(logins, job_results) if result is not None}
+            for (_, _, logins), job_results in zip(jobs, per_job)
+        ]
+
+    updated = {repo: dict(repo_counts) for repo, repo_counts in counts.items()}
+    for (repo, _, _), result in zip(jobs, results):
+        repo_counts = updated.setdefault(repo, {})
+        for login, (i_count, p_count) in result.items():
+            prev = repo_counts.get(login, {})
+            repo_counts[login] = {
+                "issues": prev.get("issues", 0) + i_count,
+                "prs": prev.get("prs", 0) + p_count,
+                "as_of": until,
+            }
+    return updated
+
+async def get_user_meta(session, sem, login, cache):
     """
     Fetch avatar_url and html_url for a GitHub login. Returns dict with 'avatar' and 'url'.
+    Entries in cache younger than USER_META_TTL are returned without a request;
+    stale entries are revalidated with their ETag and refreshed in place.
     """
+    entry = cache.get(login)
+    now = int(time.time())
+    if entry and now - entry.get("fetched_at", 0) < USER_META_TTL:
+        return entry
     url = f"https://api.github.com/users/{login}"
-    resp = requests.get(url, headers=HEADERS)
-    if handle_rate_limit(resp):
-        resp = requests.get(url, headers=HEADERS)
-    if resp.status_code == 200:
-        j = resp.json()
-        return {"avatar": j.get("avatar_url", ""), "url": j.get("html_url", f"https://github.com/{login}")}
+    headers = {"If-None-Match": entry["etag"]} if entry and entry.get("etag") else None
+    resp, body = await api_request(session, sem, "GET", url, headers=headers)
+    if resp is not None and resp.status == 304 and entry:
+        entry["fetched_at"] = now
+        return entry
+    if resp is not None and resp.status == 200:
+        j = orjson.loads(body)
+        cache[login] = {
+            "avatar": j.get("avatar_url", ""),
+            "url": j.get("html_url", f"https://github.com/{login}"),
+            "etag": resp.headers.get("ETag", ""),
+            "fetched_at": now,
+        }
+        return cache[login]
+    if entry:
+        return entry
     return {"avatar": "", "url": f"https://github.com/{login}"}
 
-def build_markdown(sorted_users, include_prs_issues=False, show_zero=False):
-    if include_prs_issues:
-        md = ["# 🧑‍💻 All-time Contribution Leaderboard (Commits + PRs + Issues)\n"]
-        md.append("| Rank | Avatar | User | Total Commits | PRs | Issues | Total |")
-        md.append("|------|---------|------|----------------|-----:|-------:|------:|")
-        for i, (login, data) in enumerate(sorted_users, 1):
-            avatar_md = f'<img src="{data.get("avatar", "")}" width="40" height="40" style="border-radius:50%"/>' if data.get("avatar") else ""
-            commits = data.get("commits", 0)
-            prs = data.get("prs", 0)
-            issues = data.get("issues", 0)
-            total = commits + prs + issues
-            md.append(f"| {i} | {avatar_md} | [{login}]({data['url']}) | {commits} | {prs} | {issues} | {total} |")
-    else:
-        md = ["# 🧑‍💻 All-time Contribution Leaderboard (Commits)\n"]
-        md.append("| Rank | Avatar | User | Total Commits |")
-        md.append("|------|---------|------|----------------|")
-        for i, (login, data) in enumerate(sorted_users, 1):
-            avatar_md = f'<img src="{data.get("avatar", "")}" width="40" height="40" style="border-radius:50%"/>' if data.get("avatar") else ""
-            md.append(f"| {i} | {avatar_md} | [{login}]({data['url']}) | {data.get('commits',0)} |")
-    return "\n".join(md)
+def make_session():
+    """
+    Build the one ClientSession used for the whole run. Keep-alive connections
+    are pooled per host, so repeated calls to api.github.com reuse TLS sessions.
+    """
+    connector = aiohttp.TCPConnector(
+        limit=MAX_CONNECTIONS,
+        limit_per_host=MAX_CONNECTIONS,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+        ttl_dns_cache=300,
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        headers=DEFAULT_HEADERS,
+        json_serialize=lambda obj: orjson.dumps(obj).decode(),
+        timeout=aiohttp.ClientTimeout(sock_connect=REQUEST_TIMEOUT, sock_read=REQUEST_TIMEOUT),
+    )
+
+async def run_all(repos, participants, include_prs_issues=False, include_zero=False):
+    """
+    Fetch all counts and user metadata over a single shared aiohttp session.
+    Returns a dict of login -> user data for the leaderboard.
+    """
+    commits_counts = Counter()
+    prs_counts = Counter()
+    issues_counts = Counter()
+    meta_from_contribs = {}
+
+    etag_cache = load_cache(ETAG_CACHE)
+    user_meta_cache = load_cache(USER_META_CACHE)
+    sem = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    async with make_session() as session:
+        print(f"Processing contributors for repos: {repos}")
+        results = await asyncio.gather(*[fetch_contributors_for_repo(session, sem, repo, etag_cache, participants) for repo in repos])
+        for contribs in results:
+            commits, meta = match_contributors(contribs, participants)
+            commits_counts.update(commits)
+            meta_from_contribs.update(meta)
+
+        if include_prs_issues:
+            print("Counting PRs and Issues authored by participants (this may make many API calls)...")
+            state = load_cache(STATE_FILE)
+            if state.get("last_run"):
+                print(f"Fetching only PRs and Issues created since the last run ({state['last_run']})")
+            # stop short of now: items created in the last SEARCH_INDEX_LAG may not be searchable yet
+            until = (datetime.now(timezone.utc) - timedelta(seconds=SEARCH_INDEX_LAG)).strftime(ISO_FORMAT)
+            state_counts = await count_issues_and_prs(session, sem, repos, participants, state.get("counts", {}), until)
+            for repo in repos:
+                repo_counts = state_counts.get(repo, {})
+                matched = repo_counts.keys() & participants
+                issues_counts.update({login: repo_counts[login]["issues"] for login in matched})
+                prs_counts.update({login: repo_counts[login]["prs"] for login in matched})
+            save_cache(STATE_FILE, {"last_run": until, "counts": state_counts})
+
+        logins = [
+            login for login in participants
+            if include_zero or commits_counts.get(login, 0) + prs_counts.get(login, 0) + issues_counts.get(login, 0)
+        ]
+        # contributors already carry avatar/profile URLs; only look up the rest
+        missing = [login for login in logins if login not in meta_from_contribs]
+        fetched = await asyncio.gather(*[get_user_meta(session, sem, login, user_meta_cache) for login in missing])
+        metas = {**meta_from_contribs, **dict(zip(missing, fetched))}
+
+        users = {}
+
+        for login in logins:
+            meta = metas[login]
+            commits = commits_counts.get(login, 0)
+            prs = prs_counts.get(login, 0)
+            issues = issues_counts.get(login, 0)
+            users[login] = {
+                "avatar": meta.get("avatar", ""),
+                "url": meta.get("url", f"https://github.com/{login}"),
+                "commits": commits,
+                "prs": prs,
+                "issues": issues,
+                "total": commits + prs + issues,
+            }
+    save_cache(ETAG_CACHE, etag_cache)
+    save_cache(USER_META_CACHE, user_meta_cache)
+    return users
 
 def main():
     parser = argparse.ArgumentParser(description="Generate an all-time contribution leaderboard.")
@@ -143,68 +464,22 @@ def main():
         print("Participants list is empty. Exiting.", file=sys.stderr)
         sys.exit(1)
 
-    if not TOKEN:
-        print("Warning: TOKEN environment variable missing. Unauthenticated requests are severely rate-limited and private repos won't be included.", file=sys.stderr)
+    if not TOKENS:
+        print("Warning: TOKENS/TOKEN environment variable missing. Unauthenticated requests are severely rate-limited and private repos won't be included.", file=sys.stderr)
 
     print(f"Computing all-time contributions across repos: {repos}")
     print(f"Options: include_zero={args.include_zero}, include_prs_issues={args.include_prs_issues}")
 
-    commits_counts = defaultdict(int)
-    prs_counts = defaultdict(int)
-    issues_counts = defaultdict(int)
+    users = asyncio.run(run_all(repos, participants, args.include_prs_issues, args.include_zero))
 
-    for repo in repos:
-        print(f"Processing contributors for repo: {repo}")
-        contribs = fetch_contributors_for_repo(repo)
-        for c in contribs:
-            login = c.get("login")
-            if not login:
-                continue
-            if login not in participants:
-                continue
-            contributions = c.get("contributions", 0)
-            commits_counts[login] += contributions
-
-    if args.include_prs_issues:
-        print("Counting PRs and Issues authored by participants (this may make many API calls)...")
-        for repo in repos:
-            print(f"Processing issues/PRs for repo: {repo}")
-            for login in participants:
-                i_count, p_count = fetch_issues_and_prs_for_author(repo, login)
-                if i_count:
-                    issues_counts[login] += i_count
-                if p_count:
-                    prs_counts[login] += p_count
-
-    users = {}
-
-    for login in participants:
-        commits = commits_counts.get(login, 0)
-        prs = prs_counts.get(login, 0)
-        issues = issues_counts.get(login, 0)
-        total = commits + prs + issues
-        if not args.include_zero and total == 0:
-            continue
-        meta = get_user_meta(login)
-        users[login] = {
-            "avatar": meta.get("avatar", ""),
-            "url": meta.get("url", f"https://github.com/{login}"),
-            "commits": commits,
-            "prs": prs,
-            "issues": issues,
-        }
-
-    # Sort
-    if args.include_prs_issues:
-        sorted_users = sorted(users.items(), key=lambda x: (x[1].get("commits",0) + x[1].get("prs",0) + x[1].get("issues",0)), reverse=True)
-    else:
-        sorted_users = sorted(users.items(), key=lambda x: x[1].get("commits",0), reverse=True)
+    # Sort by total (just commits unless PRs/issues were counted), ties by login
+    sorted_users = rank_users(users)
 
-    md = build_markdown(sorted_users, include_prs_issues=args.include_prs_issues, show_zero=args.include_zero)
+    lines = build_markdown_iter(sorted_users, include_prs_issues=args.include_prs_issues, show_zero=args.include_zero)
 
     out_path = "README.md"
-    with open(out_path, "w", encoding="utf-8") as f:
-        f.write(md)
+    with open(out_path, "w", encoding="utf-8", buffering=WRITE_BUFFER_SIZE) as f:
+        f.writelines(line + "\n" for line in lines)
     print(f"Wrote leaderboard to {out_path}")
 
 if __name__ == "__main__":
@@ -0,0 +1,55 @@
+"""
+Pure aggregation and rendering helpers for contrib_tracker.py.
+
+Nothing here touches the network or the filesystem, and everything is fully
+annotated so the module can be compiled with mypyc if local processing ever
+outweighs the API calls.
+"""
+from typing import Any, Dict, Iterable, Iterator, List, Set, Tuple
+
+User = Dict[str, Any]
+
+
+def match_contributors(contribs: Iterable[Dict[str, Any]], participants: Set[str]) -> Tuple[Dict[str, int], Dict[str, Dict[str, str]]]:
+    """
+    Pick the participants out of a repo's contributor list.
+    Returns (commits by login, {"avatar", "url"} meta by login).
+    """
+    by_login = {c["login"]: c for c in contribs if c.get("login")}
+    matched = by_login.keys() & participants
+    commits = {login: by_login[login].get("contributions", 0) for login in matched}
+    meta = {
+        login: {"avatar": by_login[login]["avatar_url"], "url": by_login[login].get("html_url") or f"https://github.com/{login}"}
+        for login in matched if by_login[login].get("avatar_url")
+    }
+    return commits, meta
+
+
+def rank_users(users: Dict[str, User]) -> List[Tuple[str, User]]:
+    """
+    Order users by total, highest first, breaking ties by login.
+    """
+    ranked = sorted((-data["total"], login, data) for login, data in users.items())
+    return [(login, data) for _, login, data in ranked]
+
+
+def avatar_cell(avatar: str) -> str:
+    return f'<img src="{avatar}" width="40" height="40" style="border-radius:50%"/>' if avatar else ""
+
+
+def build_markdown_iter(sorted_users: Iterable[Tuple[str, User]], include_prs_issues: bool = False, show_zero: bool = False) -> Iterator[str]:
+    """
+    Yield the leaderboard table line by line. Each user dict must carry avatar, url, commits, prs, issues and total.
+    """
+    if include_prs_issues:
+        yield "# 🧑‍💻 All-time Contribution Leaderboard (Commits + PRs + Issues)\n"
+        yield "| Rank | Avatar | User | Total Commits | PRs | Issues | Total |"
+        yield "|------|---------|------|----------------|-----:|-------:|------:|"
+        for i, (login, d) in enumerate(sorted_users, 1):
+            yield f"| {i} | {avatar_cell(d['avatar'])} | [{login}]({d['url']}) | {d['commits']} | {d['prs']} | {d['issues']} | {d['total']} |"
+    else:
+        yield "# 🧑‍💻 All-time Contribution Leaderboard (Commits)\n"
+        yield "| Rank | Avatar | User | Total Commits |"
+        yield "|------|---------|------|----------------|"
+        for i, (login, d) in enumerate(sorted_users, 1):
+            yield f"| {i} | {avatar_cell(d['avatar'])} | [{login}]({d['url']}) | {d['commits']} |"